@@ -2,6 +2,8 @@
 
 import os
 import sys
+import queue
+import atexit
 import logging
 import logging.handlers
 from aoconfig import CFG
@@ -9,21 +11,34 @@ from aoconfig import CFG
 def setuplogs():
     log_dir = os.path.join(os.path.expanduser("~"), ".autoortho-data", "logs")
     if not os.path.isdir(log_dir):
-        os.makedirs(log_dir)
+        os.makedirs(log_dir, exist_ok=True)
 
     log_level=logging.DEBUG if os.environ.get('AO_DEBUG') or CFG.general.debug else logging.INFO
+    handlers=[
+        #logging.FileHandler(filename=os.path.join(log_dir, "autoortho.log")),
+        logging.handlers.RotatingFileHandler(
+            filename=os.path.join(log_dir, "autoortho.log"),
+            maxBytes=10485760,
+            backupCount=5
+        ),
+        logging.StreamHandler() if sys.stdout is not None else logging.NullHandler()
+    ]
+
+    # FUSE threads log from hot read paths.  Only enqueue records there and
+    # let a single listener thread do the file and console writes.
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        *handlers,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     logging.basicConfig(
             #filename=os.path.join(log_dir, "autoortho.log"),
             level=log_level,
-            handlers=[
-                #logging.FileHandler(filename=os.path.join(log_dir, "autoortho.log")),
-                logging.handlers.RotatingFileHandler(
-                    filename=os.path.join(log_dir, "autoortho.log"),
-                    maxBytes=10485760,
-                    backupCount=5
-                ),
-                logging.StreamHandler() if sys.stdout is not None else logging.NullHandler()
-            ]
+            handlers=[logging.handlers.QueueHandler(log_queue)]
     )
     log = logging.getLogger(__name__)
     log.info(f"Setup logs: {log_dir}, log level: {log_level}")
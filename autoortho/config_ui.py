@@ -25,6 +25,29 @@ from version import __version__
 
 CUR_PATH = os.path.dirname(os.path.realpath(__file__))
 
+
+def scan_cache(path):
+    # Yield (mtime, size, path) for every file under path.  scandir hands
+    # back the stat info with the directory listing, so each file is only
+    # stat'ed once.  Like glob, missing or unreadable dirs are skipped.
+    try:
+        it = os.scandir(path)
+    except (FileNotFoundError, PermissionError):
+        return
+
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from scan_cache(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    yield st.st_mtime, st.st_size, entry.path
+            except FileNotFoundError:
+                # Removed while we were scanning
+                continue
+
+
 class ConfigUI(object):
    
     status = None
@@ -479,17 +502,18 @@ class ConfigUI(object):
         target_gb = max(size_gb, 10)
         target_bytes = pow(2,30) * target_gb
 
-        cfiles = sorted(pathlib.Path(cache_dir).glob('**/*'), key=os.path.getmtime)
+        # (mtime, size, path) for every file, oldest first
+        cfiles = sorted(scan_cache(cache_dir))
         if not cfiles:
             self.show_status(f"Cache is empty.")
             return
 
-        cache_bytes = sum(file.stat().st_size for file in cfiles)
+        cache_bytes = sum(size for _, size, _ in cfiles)
         cachecount = len(cfiles)
         avgcachesize = cache_bytes/cachecount
         self.show_status(f"Cache has {cachecount} files.  Total size approx {cache_bytes//1048576} MB.")
 
-        empty_files = [ x for x in cfiles if x.stat().st_size == 0 ]
+        empty_files = [ path for _, size, path in cfiles if size == 0 ]
         self.show_status(f"Found {len(empty_files)} empty files to cleanup.")
         for file in empty_files:
             if os.path.exists(file):
@@ -502,8 +526,8 @@ class ConfigUI(object):
         to_delete = int(( cache_bytes - target_bytes ) // avgcachesize)
 
         self.show_status(f"Over cache size limit, will remove {to_delete} files.")
-        self.status.update(cfiles[to_delete])
-        for file in cfiles[:to_delete]:
+        self.status.update(cfiles[to_delete][2])
+        for _, _, file in cfiles[:to_delete]:
             os.remove(file)
 
         self.status.update(f"Cache cleanup done.")
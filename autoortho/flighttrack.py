@@ -10,7 +10,7 @@ import logging
 log = logging.getLogger(__name__)
 
 from flask import Flask, render_template, url_for, request, jsonify
-from flask_socketio import SocketIO, send, emit
+from flask_socketio import SocketIO, send, emit, join_room
 
 from xp_udp import DecodePacket, RequestDataRefs
 
@@ -26,11 +26,9 @@ socketio = SocketIO(app)
 
 class FlightTracker(object):
     
-    lat = -1
-    lon = -1
-    alt = -1
-    hdg = -1
-    spd = -1
+    # (lat, lon, alt, hdg, spd, monotonic timestamp).  Replaced as a whole on
+    # each packet so readers never see values from different packets.
+    state = (-1, -1, -1, -1, -1, 0)
     t = None
 
     def __init__(self):
@@ -38,10 +36,34 @@ class FlightTracker(object):
                             socket.SOCK_DGRAM) # UDP
 
         self.sock.settimeout(5.0)
+        # Reused for every received packet to avoid a new bytes object each
+        # time
+        self._buf = bytearray(1024)
+        self._view = memoryview(self._buf)
         self.connected = False
         self.running = False
         self.num_failures = 0
 
+    @property
+    def lat(self):
+        return self.state[0]
+
+    @property
+    def lon(self):
+        return self.state[1]
+
+    @property
+    def alt(self):
+        return self.state[2]
+
+    @property
+    def hdg(self):
+        return self.state[3]
+
+    @property
+    def spd(self):
+        return self.state[4]
+
     def start(self):
         self.running = True
         self.start_time = time.time()
@@ -64,9 +86,10 @@ class FlightTracker(object):
         log.debug("Listen!")
         RequestDataRefs(self.sock, CFG.flightdata.xplane_udp_port)
         while self.running:
-            time.sleep(0.1)
+            # Block on the socket itself.  The socket timeout drives
+            # disconnect detection below.
             try:
-                data, addr = self.sock.recvfrom(1024)
+                nbytes, addr = self.sock.recvfrom_into(self._buf)
             except socket.timeout:
 
                 if self.connected:
@@ -103,7 +126,7 @@ class FlightTracker(object):
 
             self.connected = True
 
-            values = DecodePacket(data)
+            values = DecodePacket(self._view[:nbytes])
             lat = values[0][0]
             lon = values[1][0]
             alt = values[3][0]
@@ -112,11 +135,7 @@ class FlightTracker(object):
 
             log.debug(f"Lat: {lat}, Lon: {lon}, Alt: {alt}")
             
-            self.alt = alt
-            self.lat = lat
-            self.lon = lon
-            self.hdg = hdg
-            self.spd = spd
+            self.state = (lat, lon, alt, hdg, spd, time.monotonic())
 
 
         log.info("UDP listen thread exiting...")
@@ -138,28 +157,55 @@ def connect():
 def disconnect():
     log.info(f'client disconnected {request.sid}')
 
-@socketio.on('handle_latlon')
-def handle_latlon():
-    log.info("Handle lat lon.")
+# One broadcast task per event, shared by every client in its room
+_broadcast_tasks = {}
+_broadcast_lock = threading.Lock()
+
+def _start_broadcast(name, target):
+    with _broadcast_lock:
+        if name not in _broadcast_tasks:
+            _broadcast_tasks[name] = socketio.start_background_task(
+                _run_broadcast, name, target
+            )
+
+def _run_broadcast(name, target):
+    # If the loop dies, forget it so the next client to join restarts it
+    try:
+        target()
+    except Exception:
+        log.exception(f"{name} broadcast stopped")
+    finally:
+        with _broadcast_lock:
+            _broadcast_tasks.pop(name, None)
+
+def _broadcast_latlon():
     while True:
-        lat = ft.lat
-        lon = ft.lon
+        lat, lon, *_ = ft.state
         #lat, lon, alt, hdg, spd = ft.get_info()
         log.debug(f"emit: {lat} X {lon}")
-        socketio.emit('latlon', {"lat":lat,"lon":lon})
+        socketio.emit('latlon', {"lat":lat,"lon":lon}, to='latlon')
         socketio.sleep(2)
 
+def _broadcast_metrics():
+    while True:
+        socketio.emit('metrics', STATS or {"init": 1}, to='metrics')
+        socketio.sleep(5)
+
+@socketio.on('handle_latlon')
+def handle_latlon():
+    log.info("Handle lat lon.")
+    join_room('latlon')
+    _start_broadcast('latlon', _broadcast_latlon)
+
 @socketio.on("handle_metrics")
 def handle_metrics():
     log.info("Handle metrics.")
-    while True:
-        socketio.emit('metrics', STATS or {"init": 1})
-        socketio.sleep(5)
+    join_room('metrics')
+    _start_broadcast('metrics', _broadcast_metrics)
 
 @app.route('/get_latlon')
 def get_latlon():
-    lat = ft.lat
-    lon = ft.lon
+    lat, lon, *_ = ft.state
     #lat, lon, alt, hdg, spd = ft.get_info()
     log.debug(f"{lat} X {lon}")
     return jsonify({"lat":lat,"lon":lon})
@@ -155,7 +155,19 @@ class ChunkGetter(Getter):
         #log.debug(f"{obj}, {args}, {kwargs}")
         return obj.get(*args, **kwargs)
 
-chunk_getter = ChunkGetter(int(CFG.autoortho.fetch_threads))
+# Started on first use so that importing this module doesn't spin up the
+# fetch worker threads and HTTP session.
+_chunk_getter = None
+_chunk_getter_lock = threading.Lock()
+
+def get_chunk_getter():
+    global _chunk_getter
+    if _chunk_getter is None:
+        with _chunk_getter_lock:
+            if _chunk_getter is None:
+                _chunk_getter = ChunkGetter(int(CFG.autoortho.fetch_threads))
+                log.info(f"chunk_getter: {_chunk_getter}")
+    return _chunk_getter
 
 #class TileGetter(Getter):
 #    def get(self, obj, *args, **kwargs):
@@ -164,7 +176,6 @@ chunk_getter = ChunkGetter(int(CFG.autoortho.fetch_threads))
 #
 #tile_getter = TileGetter(8)
 
-log.info(f"chunk_getter: {chunk_getter}")
 #log.info(f"tile_getter: {tile_getter}")
 
 
@@ -410,7 +421,7 @@ class Tile(object):
             self.priority = zoom
 
         if not os.path.isdir(self.cache_dir):
-            os.makedirs(self.cache_dir)
+            os.makedirs(self.cache_dir, exist_ok=True)
 
         if CFG.pydds.compressor.upper() == "ISPC":
             use_ispc=True
@@ -490,7 +501,7 @@ class Tile(object):
         col, row, width, height, zoom, zoom_diff = self._get_quick_zoom(quick_zoom)
 
         for chunk in self.chunks[zoom]:
-            chunk_getter.submit(chunk)
+            get_chunk_getter().submit(chunk)
 
         for chunk in self.chunks[zoom]:
             ret = chunk.ready.wait()
@@ -696,7 +707,7 @@ class Tile(object):
             if not chunk.ready.is_set():
                 #log.info(f"SUBMIT: {chunk}")
                 chunk.priority = self.min_zoom - mipmap 
-                chunk_getter.submit(chunk)
+                get_chunk_getter().submit(chunk)
                 data_updated = True
 
         # We've already determined this mipmap is not marked as 'retrieved' so we should create 
@@ -20,7 +20,9 @@ smallimg_rgba = smallimg.convert('RGBA')
 #testimg.convert('RGBA')
 #smallimg.convert('RGBA')
 
+import gc
 import timeit
+import statistics
 
 #def test_conv(inimg, outfile):
 #    conv.conv(inimg, outfile) 
@@ -57,6 +59,12 @@ def test_wand(inimg, outfile):
 
 def main():
     NUMRUNS=30
+    REPEATS=3
+
+    # Keep the loaded test images out of the collector's way.  timeit
+    # already disables GC while timing.
+    gc.collect()
+    gc.freeze()
 
     #t = timeit.timeit("test_conv(testimg, 'out.dds')", setup='from __main__ import test_conv, testimg', number=NUMRUNS)
     #print(f"SOIL2: {t}")
@@ -91,8 +99,10 @@ def main():
 
     for test in tests:
         #print(f"Testing {test[1]} ... for {test[0]}")
-        t = timeit.timeit(test[1], setup='from __main__ import test_scale, test_pydds, testimg, testimg_rgba, smallimg, smallimg_rgba, test_nvcompress', number=NUMRUNS)
-        print(f"{test[0]}: total {t}  per {t/NUMRUNS}")
+        number = NUMRUNS // REPEATS
+        times = timeit.repeat(test[1], setup='from __main__ import test_scale, test_pydds, testimg, testimg_rgba, smallimg, smallimg_rgba, test_nvcompress', repeat=REPEATS, number=number)
+        per = [ t/number for t in times ]
+        print(f"{test[0]}: total {sum(times)}  per {statistics.mean(per)}  median {statistics.median(per)}  min {min(per)}")
 
 
     # Wand is super slow, don't bother
@@ -11,6 +11,7 @@ from aoimage import AoImage as Image
 
 import platform
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 #from functools import lru_cache, cache
 
@@ -21,14 +22,17 @@ import logging
 log = logging.getLogger(__name__)
 
 #_stb = CDLL("/usr/lib/x86_64-linux-gnu/libstb.so")
-if platform.system().lower() == 'linux':
+# Resolve our install dir once rather than per library
+_BASE_DIR = os.path.dirname(os.path.realpath(__file__))
+_system_type = platform.system().lower()
+if _system_type == 'linux':
     print("Linux detected")
-    _stb_path = os.path.join(os.path.dirname(os.path.realpath(__file__)),'lib','linux','lib_stb_dxt.so')
-    _ispc_path = os.path.join(os.path.dirname(os.path.realpath(__file__)),'lib','linux','libispc_texcomp.so')
-elif platform.system().lower() == 'windows':
+    _stb_path = os.path.join(_BASE_DIR, 'lib', 'linux', 'lib_stb_dxt.so')
+    _ispc_path = os.path.join(_BASE_DIR, 'lib', 'linux', 'libispc_texcomp.so')
+elif _system_type == 'windows':
     print("Windows detected")
-    _stb_path = os.path.join(os.path.dirname(os.path.realpath(__file__)),'lib','windows','stb_dxt.dll')
-    _ispc_path = os.path.join(os.path.dirname(os.path.realpath(__file__)),'lib','windows','ispc_texcomp.dll')
+    _stb_path = os.path.join(_BASE_DIR, 'lib', 'windows', 'stb_dxt.dll')
+    _ispc_path = os.path.join(_BASE_DIR, 'lib', 'windows', 'ispc_texcomp.dll')
 else:
     print("System is not supported")
     exit()
@@ -36,6 +40,19 @@ else:
 _stb = CDLL(_stb_path)
 _ispc = CDLL(_ispc_path)
 
+# ctypes releases the GIL for the duration of a foreign call, so ISPC can
+# compress separate row stripes of one large mipmap on several threads.
+# The pool is shared by every tile being built, so it is sized to the
+# machine.  Threads are only started once the first stripe is submitted.
+# Mipmaps with this much RGBA data or less are quicker in a single call than
+# split across threads.
+ISPC_INLINE_BYTES = 1048576
+_ispc_workers = os.cpu_count() or 1
+_ispc_pool = ThreadPoolExecutor(
+    max_workers=_ispc_workers,
+    thread_name_prefix="pydds_ispc"
+)
+
 DDSD_CAPS = 0x00000001          # dwCaps/dwCaps2 is enabled. 
 DDSD_HEIGHT = 0x00000002                # dwHeight is enabled. 
 DDSD_WIDTH = 0x00000004                 # dwWidth is enabled. Required for all textures. 
@@ -115,6 +132,12 @@ class rgba_surface(Structure):
     ]
 
 
+# Bind prototypes once rather than on every compress call
+_ispc.CompressBlocksBC1.argtypes = (POINTER(rgba_surface), c_char_p)
+_ispc.CompressBlocksBC3.argtypes = (POINTER(rgba_surface), c_char_p)
+_stb.compress_pixels.argtypes = (c_char_p, c_char_p, c_uint64, c_uint64, c_bool)
+
+
 class DDS(Structure):
     _fields_ = [
         ('magic', c_char * 4),
@@ -343,78 +366,92 @@ class DDS(Structure):
         self.header.seek(0)
         self.header.write(self)
 
+    def dxt_size(self, width, height):
+        # Bytes of compressed output for width * height of data
+        if self.ispc and self.dxt_format in ("BC1", "BC3"):
+            blocksize = self.blocksize
+        else:
+            # STB always writes 16 byte blocks
+            blocksize = 16
+        return ((width+3) >> 2) * ((height+3) >> 2) * blocksize
+
+    def _ispc_compress(self, ispc_compress, width, height, data, outdata):
+        # Split into row stripes, a multiple of 4 rows each, and compress
+        # them in parallel.  Small mipmaps are done in a single call.
+        #
+        # Aim for two stripes per worker so each worker gets more than one
+        # stripe without dispatch overhead dominating.
+        stride = width * 4
+        stripe_rows = max(4, ((height // (_ispc_workers * 2) + 3) // 4) * 4)
+        row_bytes = (width >> 2) * self.blocksize
+        out_addr = addressof(outdata)
+
+        def do_stripe(start_row, rows=stripe_rows):
+            rows = min(rows, height - start_row)
+            s = rgba_surface(data + start_row * stride, width, rows, stride)
+            ispc_compress(byref(s), c_char_p(out_addr + (start_row >> 2) * row_bytes))
+
+        if _ispc_workers == 1 or height * stride <= ISPC_INLINE_BYTES:
+            do_stripe(0, height)
+            return
+
+        # The calling thread and the pool helpers pull stripes from the same
+        # iterator.  If the pool is busy with other tiles, the caller works
+        # through the stripes itself instead of waiting for a free worker.
+        stripes = iter(range(0, height, stripe_rows))
+        stripes_lock = threading.Lock()
+
+        def work():
+            while True:
+                with stripes_lock:
+                    start_row = next(stripes, None)
+                if start_row is None:
+                    return
+                do_stripe(start_row)
+
+        helpers = [
+            _ispc_pool.submit(work)
+            for _ in range(min(_ispc_workers, -(-height // stripe_rows)) - 1)
+        ]
+        work()
+
+        # Helpers still queued behind other tiles have nothing left to do, so
+        # cancel them rather than wait for a thread.  Raise any exceptions
+        # from the ones that ran.
+        for f in helpers:
+            if not f.cancel():
+                f.result()
+
     #@profile 
-    def compress(self, width, height, data):
+    def compress(self, width, height, data, out_buf=None):
         # Compress width * height of data
+        # out_buf : Optional writable buffer of at least dxt_size() bytes to
+        #           compress into, rather than allocating a new one
 
         if (width < 4 or width % 4 != 0 or height < 4 or height % 4 != 0):
             log.debug(f"Compressed images must have dimensions that are multiples of 4. We got {width}x{height}")
             return None
 
-        #outdata = b'\x00'*dxt_size
-        
-        #bio.write(b'\x00'*dxt_size)
-        #outdata = bio.getbuffer().tobytes()
+        dxt_size = self.dxt_size(width, height)
+        if out_buf is not None:
+            outdata = (c_char * dxt_size).from_buffer(out_buf)
+        else:
+            outdata = create_string_buffer(dxt_size)
 
+        if self.ispc and self.dxt_format in ("BC1", "BC3"):
+            if self.dxt_format == "BC3":
+                ispc_compress = _ispc.CompressBlocksBC3
+            else:
+                ispc_compress = _ispc.CompressBlocksBC1
 
-        if self.ispc and self.dxt_format == "BC3":
-            dxt_size = ((width+3) >> 2) * ((height+3) >> 2) * self.blocksize
-            outdata = create_string_buffer(dxt_size)
-            #print(f"LEN: {len(outdata)}")
-            s = rgba_surface()
-            s.data = c_char_p(data)
-            s.width = c_uint32(width)
-            s.height = c_uint32(height)
-            s.stride = c_uint32(width * 4)
-            
             #print("Will do ispc")
-            _ispc.CompressBlocksBC3.argtypes = (
-                POINTER(rgba_surface),
-                c_char_p
-            )
-
-            _ispc.CompressBlocksBC3(
-                s, outdata
-            )
-            result = True
-        elif self.ispc and self.dxt_format == "BC1":
-            #print("BC1")
-            blocksize = 8
-            dxt_size = ((width+3) >> 2) * ((height+3) >> 2) * self.blocksize
-            outdata = create_string_buffer(dxt_size)
-            #print(f"LEN: {len(outdata)}")
-        
-            s = rgba_surface()
-            s.data = c_char_p(data)
-            s.width = c_uint32(width)
-            s.height = c_uint32(height)
-            s.stride = c_uint32(width * 4)
-            
-            #print("Will do ispc")
-            _ispc.CompressBlocksBC1.argtypes = (
-                POINTER(rgba_surface),
-                c_char_p
-            )
-
-            _ispc.CompressBlocksBC1(
-                s, outdata
-            )
+            self._ispc_compress(ispc_compress, width, height, data, outdata)
             result = True
         else:
             is_rgba = True
             #print("Will use stb")
-            blocksize = 16
-            dxt_size = ((width+3) >> 2) * ((height+3) >> 2) * blocksize
-            outdata = create_string_buffer(dxt_size)
 
             #print(f"LEN: {len(outdata)}")
-            _stb.compress_pixels.argtypes = (
-                    c_char_p,
-                    c_char_p, 
-                    c_uint64, 
-                    c_uint64, 
-                    c_bool)
-
             result = _stb.compress_pixels(
                     outdata,
                     c_char_p(data),
@@ -490,13 +527,20 @@ class DDS(Structure):
                         log.debug(f"Doing partial compress of {compress_bytes} bytes.  Height: {height}")
                         compress_bytes >>= 2
 
+                    # Compress directly into the mipmap's buffer rather
+                    # than copying the result into it afterwards
+                    dxtdata = None
+                    dxtbuffer = BytesIO()
+                    dxtbuffer.seek(self.dxt_size(width, height) - 1)
+                    dxtbuffer.write(b'\x00')
+                    dxtview = dxtbuffer.getbuffer()
                     try:
-                        dxtdata = self.compress(width, height, imgdata)
+                        dxtdata = self.compress(width, height, imgdata, dxtview)
                     except:
                         log.warning("dds compress failed")
 
                     if dxtdata is not None:
-                        self.mipmap_list[mipmap].databuffer = BytesIO(initial_bytes=dxtdata)
+                        self.mipmap_list[mipmap].databuffer = dxtbuffer
                         if not compress_bytes:
                             self.mipmap_list[mipmap].retrieved = True
 
@@ -509,7 +553,9 @@ class DDS(Structure):
                                 mm.retrieved = True
                                 mipmap += 1
 
+                    # Drop the ctypes view so the buffer is no longer exported
                     dxtdata = None
+                    dxtview.release()
 
             
                 if mipmap >= maxmipmaps: #(maxmipmaps + 1) or mipmap >= self.smallest_mm:
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+
+import os
+
+import config_ui
+
+
+def test_scan_cache_missing_dir(tmpdir):
+    assert list(config_ui.scan_cache(os.path.join(tmpdir, 'nope'))) == []
+
+def test_scan_cache_nested(tmpdir):
+    os.makedirs(os.path.join(tmpdir, 'a', 'b'))
+    with open(os.path.join(tmpdir, 'top.jpg'), 'wb') as h:
+        h.write(b'x' * 10)
+    with open(os.path.join(tmpdir, 'a', 'b', 'deep.jpg'), 'wb') as h:
+        h.write(b'x' * 3)
+    open(os.path.join(tmpdir, 'a', 'empty.jpg'), 'wb').close()
+
+    files = { path: size for _, size, path in config_ui.scan_cache(tmpdir) }
+    assert files == {
+        os.path.join(tmpdir, 'top.jpg'): 10,
+        os.path.join(tmpdir, 'a', 'b', 'deep.jpg'): 3,
+        os.path.join(tmpdir, 'a', 'empty.jpg'): 0,
+    }
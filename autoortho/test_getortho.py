@@ -34,7 +34,7 @@ def test_null_chunk(tmpdir):
 
 def test_chunk_getter(tmpdir):
     c = getortho.Chunk(2176, 3232, 'EOX', 13, cache_dir=tmpdir)
-    getortho.chunk_getter.submit(c)
+    getortho.get_chunk_getter().submit(c)
     ready = c.ready.wait(5)
     assert ready == True
 
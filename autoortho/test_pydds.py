@@ -3,6 +3,8 @@
 import os
 import ctypes
 import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import pydds
 
@@ -187,3 +189,50 @@ def test_gen_mipmap_len(tmpdir):
         data = h.read(16)
         assert data
         assert data == b'\x00'*16
+
+
+@pytest.mark.parametrize("dxt_format", ["BC1", "BC3"])
+def test_striped_compress(dxt_format, monkeypatch):
+    timg = Image.open(TESTJPG)
+    width, height = timg.size
+    dds = pydds.DDS(4096, 4096, dxt_format=dxt_format)
+
+    monkeypatch.setattr(pydds, "_ispc_workers", 1)
+    expected = dds.compress(width, height, timg.data_ptr()).raw
+
+    # Force multiple stripes across threads
+    monkeypatch.setattr(pydds, "_ispc_workers", 4)
+    data = dds.compress(width, height, timg.data_ptr()).raw
+    assert data == expected
+
+
+def test_striped_compress_busy_pool(monkeypatch):
+    timg = Image.open(TESTJPG)
+    width, height = timg.size
+    dds = pydds.DDS(4096, 4096)
+
+    monkeypatch.setattr(pydds, "_ispc_workers", 1)
+    expected = dds.compress(width, height, timg.data_ptr()).raw
+
+    # Tie up the only pool thread, as another tile's stripes would
+    pool = ThreadPoolExecutor(max_workers=1)
+    busy = threading.Event()
+    pool.submit(busy.wait)
+    monkeypatch.setattr(pydds, "_ispc_pool", pool)
+    monkeypatch.setattr(pydds, "_ispc_workers", 4)
+
+    result = []
+    t = threading.Thread(
+        target=lambda: result.append(dds.compress(width, height, timg.data_ptr()).raw)
+    )
+    t.start()
+    t.join(30)
+    done = not t.is_alive()
+
+    busy.set()
+    t.join()
+    pool.shutdown()
+
+    # The caller does all the stripes itself instead of waiting on the pool
+    assert done
+    assert result == [expected]
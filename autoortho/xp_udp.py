@@ -1,6 +1,7 @@
 import os
 import socket
 import struct
+import binascii
 
 UDP_IP = "127.0.0.1"
 
@@ -42,24 +43,24 @@ def RequestDataRefs(sock, UDP_PORT=49000, REQ_FREQ=2):
     assert(len(message)==413)
     sock.sendto(message, (UDP_IP, int(UDP_PORT)))
 
+# Each returned dataref is an int index followed by a float value
+_RREF_VALUE = struct.Struct("<if")
+
 def DecodePacket(data):
+  # data may be bytes or any buffer (ie: a memoryview over a reused receive
+  # buffer), so values are unpacked in place without slicing copies.
   retvalues = {}
   # Read the Header "RREFO".
-  header=data[0:4]
+  header=bytes(data[0:4])
   #print(header)
   if(header!=b"RREF"):
     print("Unknown packet: ", binascii.hexlify(data))
   else:
     # We get 8 bytes for every dataref sent:
     #    An integer for idx and the float value. 
-    values =data[5:]
-    lenvalue = 8
-    numvalues = int(len(values)/lenvalue)
-    idx=0
-    value=0
+    lenvalue = _RREF_VALUE.size
+    numvalues = (len(data) - 5) // lenvalue
     for i in range(0,numvalues):
-      singledata = data[(5+lenvalue*i):(5+lenvalue*(i+1))]
-      (idx,value) = struct.unpack("<if", singledata)
+      (idx,value) = _RREF_VALUE.unpack_from(data, 5+lenvalue*i)
       retvalues[idx] = (value, datarefs[idx][1], datarefs[idx][0])
   return retvalues
-